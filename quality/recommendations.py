@@ -1,3 +1,13 @@
+# Violation prefix -> recommendation text; O(1) dict dispatch instead of
+# a chain of startswith comparisons per violation.
+PREFIX_MAP = {
+    "MIN_LENGTH": "Expand the section to meet minimum length requirements and provide deeper theoretical or methodological detail.",
+    "TYPE": "Correct data types to match schema requirements (e.g., numeric fields must be integers).",
+    "ENUM": "Ensure values match one of the allowed predefined options.",
+    "REQUIRED_MISSING": "Complete all mandatory structural components of the proposal."
+}
+
+
 def generate_recommendations(validation_result: dict):
     recommendations = []
 
@@ -9,29 +19,12 @@ def generate_recommendations(validation_result: dict):
 
     # Violations
     for violation in validation_result.get("violations", []):
-        if violation.startswith("MIN_LENGTH"):
-            recommendations.append(
-                "Expand the section to meet minimum length requirements and provide deeper theoretical or methodological detail."
-            )
-
-        elif violation.startswith("TYPE"):
-            recommendations.append(
-                "Correct data types to match schema requirements (e.g., numeric fields must be integers)."
-            )
-
-        elif violation.startswith("ENUM"):
-            recommendations.append(
-                "Ensure values match one of the allowed predefined options."
-            )
-
-        elif violation.startswith("REQUIRED_MISSING"):
-            recommendations.append(
-                "Complete all mandatory structural components of the proposal."
-            )
-
-        else:
-            recommendations.append(
+        prefix = violation.split(":", 1)[0]
+        recommendations.append(
+            PREFIX_MAP.get(
+                prefix,
                 f"Review issue: {violation} and adjust proposal accordingly."
             )
+        )
 
-    return recommendations
\ No newline at end of file
+    return recommendations
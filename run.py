@@ -0,0 +1,15 @@
+import os
+
+import uvicorn
+
+# uvloop + httptools replace the default asyncio loop and HTTP parser,
+# cutting per-request event-loop and parsing overhead roughly in half.
+if __name__ == "__main__":
+    uvicorn.run(
+        "server:app",
+        host="0.0.0.0",
+        port=int(os.environ.get("PORT", 8000)),
+        loop="uvloop",
+        http="httptools",
+        workers=os.cpu_count()
+    )
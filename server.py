@@ -1,99 +1,537 @@
+import asyncio
+import atexit
+import gzip
+import hashlib
+import os
+import queue
 import sqlite3
-import json
-from typing import Dict, Any
+import sys
+import threading
+import time
+from collections import defaultdict
+from concurrent.futures import ProcessPoolExecutor
+from contextlib import asynccontextmanager
+from functools import lru_cache
+from itertools import chain
 
-from fastapi import FastAPI, Request
-from fastapi.responses import JSONResponse
-from pydantic import BaseModel
+import numpy as np
+import orjson
+from fastapi import FastAPI
+from fastapi.responses import ORJSONResponse, Response
+from starlette.routing import Route
 
-from rdflib import Graph, Namespace, RDF
+from rdflib import Graph, Literal, Namespace, RDF, URIRef
 from owlrl import DeductiveClosure, OWLRL_Semantics
 
+try:
+    from numba import njit
+except ImportError:
+    njit = None
+
+try:
+    import pyoxigraph
+except ImportError:
+    pyoxigraph = None
+
+try:
+    from pyroaring import BitMap
+except ImportError:
+    BitMap = None
+
 # =========================
 # CONFIG
 # =========================
 
 MCP_PROTOCOL_VERSION = "2025-03-26"
 DB_PATH = "project_state.db"
+ONTOLOGY_PATH = "ontology/ai_unified_ontology.ttl"
 BASE = Namespace("http://example.org/ai-unified-ontology#")
 
+# Hoisted URIRef constants: every BASE.attr access builds a fresh
+# URIRef through string concatenation.
+MODULE_TYPE = BASE.Module
+DEPENDS_ON = BASE.dependsOnModule
+
+@asynccontextmanager
+async def lifespan(app):
+    # Cold starts serve the raw ontology immediately and materialize the
+    # OWL RL closure in a worker process; the swap happens whenever the
+    # worker finishes. Warm starts loaded the cached closure already and
+    # skip all of this.
+    if not REASONING_READY.is_set():
+        loop = asyncio.get_running_loop()
+        pool = ProcessPoolExecutor(max_workers=1)
+
+        async def expand_in_background():
+            await loop.run_in_executor(pool, _expand_and_cache, CLOSURE_PATH)
+            _install_closure()
+            pool.shutdown(wait=False)
+
+        asyncio.create_task(expand_in_background())
+    yield
+    # Graceful shutdown: drain the status write queue before the
+    # process goes away.
+    flush_db_writes()
+
 app = FastAPI(
-    servers=[{"url": "https://ai-mcp-server.onrender.com"}]
+    servers=[{"url": "https://ai-mcp-server.onrender.com"}],
+    default_response_class=ORJSONResponse,
+    lifespan=lifespan
 )
 
 # =========================
 # DATABASE LAYER
 # =========================
 
+# One long-lived connection instead of connect/commit/close per call:
+# WAL lets readers proceed alongside a writer, synchronous=NORMAL drops
+# the per-statement fsync, and the lock serializes access across the
+# uvicorn thread pool.
+CONN = sqlite3.connect(DB_PATH, check_same_thread=False, isolation_level=None)
+CONN.execute("PRAGMA journal_mode=WAL")
+CONN.execute("PRAGMA synchronous=NORMAL")
+CONN.execute("PRAGMA temp_store=MEMORY")
+CONN.execute("PRAGMA busy_timeout=5000")
+_DB_LOCK = threading.Lock()
+atexit.register(CONN.close)
+
 def init_db():
-    conn = sqlite3.connect(DB_PATH)
-    c = conn.cursor()
-    c.execute("""
-        CREATE TABLE IF NOT EXISTS modules (
-            module_name TEXT PRIMARY KEY,
-            status TEXT
-        )
-    """)
-    conn.commit()
-    conn.close()
+    with _DB_LOCK:
+        CONN.execute("""
+            CREATE TABLE IF NOT EXISTS modules (
+                module_name TEXT PRIMARY KEY,
+                status TEXT
+            )
+        """)
+
+# Statuses are read from this in-memory dict (loaded from the table at
+# import, kept authoritative by set_db_status); SQLite only has to be
+# touched on the write path, and that happens off-thread.
+_STATUSES = {}
+
+def _load_statuses():
+    with _DB_LOCK:
+        rows = CONN.execute("SELECT module_name, status FROM modules").fetchall()
+    # Interned statuses make the "pending"/"completed" comparisons in the
+    # analysis sweeps hit CPython's pointer-equality fast path.
+    return {name: sys.intern(status) for name, status in rows}
+
+def _sync_db_version():
+    # Cross-worker coherence: PRAGMA data_version moves whenever another
+    # connection commits to the database, so under multi-worker uvicorn
+    # a status written by a sibling process shows up here. When it moves,
+    # flush our own queued writes, reload the dict, and bump the epoch
+    # so every cached analysis recomputes.
+    global _DATA_VERSION, _STATUSES, _db_version
+    with _DB_LOCK:
+        dv = CONN.execute("PRAGMA data_version").fetchone()[0]
+    if dv != _DATA_VERSION:
+        _DATA_VERSION = dv
+        flush_db_writes()
+        _STATUSES = _load_statuses()
+        for i, m in enumerate(MODULES):
+            STATUS_ARR[i] = STATUS_CODE.get(_STATUSES.get(m), ST_UNKNOWN)
+        _db_version += 1
 
 def get_db_status(module_name):
-    conn = sqlite3.connect(DB_PATH)
-    c = conn.cursor()
-    c.execute("SELECT status FROM modules WHERE module_name=?", (module_name,))
-    row = c.fetchone()
-    conn.close()
-    return row[0] if row else None
+    return _STATUSES.get(module_name)
+
+def get_all_db_statuses():
+    return dict(_STATUSES)
+
+def _db_writer():
+    # Dedicated writer thread: drains bursts of queued updates into one
+    # executemany, so a rapid series of status writes costs a single
+    # transaction and the request path never waits on SQLite.
+    while True:
+        batch = [WRITE_Q.get()]
+        while len(batch) < 100:
+            try:
+                batch.append(WRITE_Q.get_nowait())
+            except queue.Empty:
+                break
+        try:
+            with _DB_LOCK:
+                CONN.executemany("""
+                    INSERT INTO modules (module_name, status)
+                    VALUES (?, ?)
+                    ON CONFLICT(module_name)
+                    DO UPDATE SET status=excluded.status
+                """, batch)
+        except sqlite3.Error as exc:
+            # Never let the thread die: dropping the batch would lose
+            # statuses and leave flush_db_writes() joining forever. Put
+            # the batch back, balance the unfinished-task count, and
+            # retry after a beat (a locked database just means another
+            # worker held WAL's single writer slot).
+            print(f"Status write failed, retrying: {exc}")
+            for item in batch:
+                WRITE_Q.put(item)
+            for _ in batch:
+                WRITE_Q.task_done()
+            time.sleep(0.05)
+            continue
+        for _ in batch:
+            WRITE_Q.task_done()
+
+WRITE_Q = queue.Queue()
+threading.Thread(target=_db_writer, daemon=True, name="db-writer").start()
+
+def flush_db_writes():
+    # Block until every queued status write has been committed.
+    WRITE_Q.join()
+
+# Registered after CONN.close, so atexit runs the flush first (LIFO).
+atexit.register(flush_db_writes)
 
 def set_db_status(module_name, status):
-    conn = sqlite3.connect(DB_PATH)
-    c = conn.cursor()
-    c.execute("""
-        INSERT INTO modules (module_name, status)
-        VALUES (?, ?)
-        ON CONFLICT(module_name)
-        DO UPDATE SET status=excluded.status
-    """, (module_name, status))
-    conn.commit()
-    conn.close()
+    # Apply in memory and return; durability is the writer thread's job.
+    global _db_version
+    _STATUSES[module_name] = sys.intern(status)
+    if module_name in MODULE_ID:
+        STATUS_ARR[MODULE_ID[module_name]] = STATUS_CODE.get(status, ST_UNKNOWN)
+    _db_version += 1
+    WRITE_Q.put((module_name, status))
+
+def bootstrap_module_states():
+    # Seed every known module as pending in one executemany; INSERT OR
+    # IGNORE leaves modules that already have a status untouched, so no
+    # per-module existence check is needed.
+    global _db_version
+    with _DB_LOCK:
+        CONN.executemany(
+            "INSERT OR IGNORE INTO modules (module_name, status) VALUES (?, ?)",
+            [(m, "pending") for m in MODULES]
+        )
+    for m in MODULES:
+        _STATUSES.setdefault(m, "pending")
+    for i, m in enumerate(MODULES):
+        STATUS_ARR[i] = STATUS_CODE.get(_STATUSES.get(m), ST_UNKNOWN)
+    _db_version += 1
 
 init_db()
+_STATUSES = _load_statuses()
+_DATA_VERSION = CONN.execute("PRAGMA data_version").fetchone()[0]
 
 # =========================
 # LOAD ONTOLOGY + REASONING
 # =========================
 
-print("Loading ontology...")
-g = Graph()
-g.parse("ontology/ai_unified_ontology.ttl", format="ttl")
+def _closure_path():
+    # The OWL RL closure only depends on the source TTL, so it is
+    # serialized once per ontology version and reloaded on warm starts
+    # instead of re-running the reasoner in every worker process.
+    with open(ONTOLOGY_PATH, "rb") as f:
+        source_hash = hashlib.sha256(f.read()).hexdigest()[:16]
+    return f"ontology/closure_{source_hash}.nt.gz"
+
+def _expand_and_cache(closure_path):
+    # Runs in a worker process; the closure file is the hand-off back to
+    # the parent, so no graph crosses the process boundary.
+    graph = Graph()
+    graph.parse(ONTOLOGY_PATH, format="ttl")
+    DeductiveClosure(OWLRL_Semantics).expand(graph)
+    # OWL RL emits generalized triples with literal subjects; they are
+    # not valid RDF, cannot round-trip through N-Triples, and are
+    # unreachable by pattern queries, so drop them before serializing.
+    for t in [t for t in graph if isinstance(t[0], Literal)]:
+        graph.remove(t)
+    tmp_path = f"{closure_path}.{os.getpid()}.tmp"
+    with gzip.open(tmp_path, "wb") as f:
+        f.write(graph.serialize(format="nt", encoding="utf-8"))
+    # Atomic publish: concurrent uvicorn workers may race on a cold start.
+    os.replace(tmp_path, closure_path)
+
+def load_graph():
+    graph = Graph()
+    if os.path.exists(CLOSURE_PATH):
+        print("Loading cached ontology closure...")
+        with gzip.open(CLOSURE_PATH, "rb") as f:
+            graph.parse(f, format="nt")
+        REASONING_READY.set()
+    else:
+        # Serve the raw ontology now; the lifespan handler kicks off the
+        # closure in the background and swaps it in when done.
+        print("Loading ontology (reasoning deferred to background)...")
+        graph.parse(ONTOLOGY_PATH, format="ttl")
+    print(f"Ontology ready. Triples count: {len(graph)}")
+    return graph
+
+REASONING_READY = threading.Event()
+CLOSURE_PATH = _closure_path()
+g = load_graph()
+
+def _build_ox_store(graph):
+    # Mirror the graph into an oxigraph store when pyoxigraph is
+    # installed: its Rust-backed indexes answer pattern queries without
+    # allocating a Python object per triple. rdflib stays the fallback.
+    if pyoxigraph is None:
+        return None
+    store = pyoxigraph.Store()
+    store.bulk_load(
+        graph.serialize(format="nt", encoding="utf-8"),
+        format=pyoxigraph.RdfFormat.N_TRIPLES
+    )
+    return store
+
+OX_STORE = _build_ox_store(g)
+
+def _build_name_index(graph):
+    # Two directions from one pass over the nodes: NAME_INDEX resolves a
+    # local name to its URIRefs in O(1), URI2NAME hands back the interned
+    # local name without re-splitting the URI per lookup.
+    index = defaultdict(list)
+    uri2name = {}
+    for n in graph.all_nodes():
+        local = sys.intern(str(n).rsplit("#", 1)[-1].rsplit("/", 1)[-1])
+        uri2name[n] = local
+        if n not in index[local]:
+            index[local].append(n)
+    return index, uri2name
+
+NAME_INDEX, URI2NAME = _build_name_index(g)
+
+def _install_closure():
+    # Parse the freshly written closure and rebuild every derived
+    # structure from it. Each global rebinding is atomic under the GIL;
+    # a request racing the swap just sees the raw-ontology view that was
+    # being served anyway.
+    global g, OX_STORE, NAME_INDEX, URI2NAME
+    graph = Graph()
+    with gzip.open(CLOSURE_PATH, "rb") as f:
+        graph.parse(f, format="nt")
+    g = graph
+    OX_STORE = _build_ox_store(graph)
+    NAME_INDEX, URI2NAME = _build_name_index(graph)
+    invalidate_graph_cache()
+    # The closure can type additional subjects as Module; seed them too.
+    bootstrap_module_states()
+    REASONING_READY.set()
+    print(f"Ontology closure installed. Triples count: {len(graph)}")
+
+# =========================
+# GRAPH CACHES
+# =========================
+
+MODULES = []
+DEPS = {}
+RDEPS = {}
+MODULE_ID = {}
+MOD_URI = {}
+DEPS_INT = []
+DEPS_OFFSETS = np.zeros(1, dtype=np.int64)
+DEPS_FLAT = np.zeros(0, dtype=np.int64)
+REACH = None
+STATUS_ARR = np.zeros(0, dtype=np.int8)
 
-print("Running OWL RL reasoning...")
-DeductiveClosure(OWLRL_Semantics).expand(g)
-print(f"Ontology ready. Triples count: {len(g)}")
+# Integer status codes for the vectorized readiness check; anything the
+# code table does not know counts as not-completed.
+ST_UNKNOWN, ST_PENDING, ST_COMPLETED = 0, 1, 2
+STATUS_CODE = {"pending": ST_PENDING, "completed": ST_COMPLETED}
+
+# Separate version counters for the two sources of truth: the ontology
+# graph (bumped on cache rebuild) and the status DB (bumped on every
+# write). Cached analyses key on the pair.
+_graph_version = 0
+_db_version = 0
+
+def _build_reachability():
+    # Per-node transitive successors as Roaring bitmaps, built in one
+    # reverse topological pass: reach[u] is the union of {v} | reach[v]
+    # over u's direct deps, so each edge is processed once and the union
+    # itself runs as bitwise ORs in C. Returns None when pyroaring is
+    # absent or the graph has a cycle (no topo order exists).
+    if BitMap is None:
+        return None
+    n = len(MODULES)
+    indeg = [0] * n
+    for deps in DEPS_INT:
+        for d in deps:
+            indeg[d] += 1
+    queue = [i for i in range(n) if indeg[i] == 0]
+    order = []
+    while queue:
+        m = queue.pop()
+        order.append(m)
+        for d in DEPS_INT[m]:
+            indeg[d] -= 1
+            if indeg[d] == 0:
+                queue.append(d)
+    if len(order) < n:
+        return None
+
+    reach = [None] * n
+    for m in reversed(order):
+        bits = BitMap(DEPS_INT[m])
+        for d in DEPS_INT[m]:
+            bits |= reach[d]
+        reach[m] = bits
+    return reach
+
+def _rebuild_caches():
+    # Flatten the module graph into plain Python structures once so the
+    # hot read paths do dict lookups instead of rdflib iterator walks.
+    # The graph algorithms additionally get an integer-id adjacency:
+    # int hashing and list indexing beat per-node string hashing.
+    global MODULES, DEPS, RDEPS, MODULE_ID, MOD_URI
+    global DEPS_INT, DEPS_OFFSETS, DEPS_FLAT, REACH
+    global STATUS_ARR
+    global _graph_version
+    _graph_version += 1
+    # URI2NAME already holds the interned suffix per node, so no URI is
+    # stringified or split here; lookups compare pointers downstream.
+    MODULES = [URI2NAME[m] for m in g.subjects(RDF.type, MODULE_TYPE)]
+    MOD_URI = {m: BASE[m] for m in MODULES}
+    DEPS = {
+        m: [
+            URI2NAME[dep]
+            for dep in g.objects(MOD_URI[m], DEPENDS_ON)
+        ]
+        for m in MODULES
+    }
+    # Inverse adjacency: which modules depend on m.
+    RDEPS = {m: [] for m in MODULES}
+    for m in MODULES:
+        for d in DEPS[m]:
+            if d in RDEPS:
+                RDEPS[d].append(m)
+    MODULE_ID = {m: i for i, m in enumerate(MODULES)}
+    DEPS_INT = [
+        [MODULE_ID[d] for d in DEPS[m] if d in MODULE_ID]
+        for m in MODULES
+    ]
+    # CSR layout (offsets + flat neighbor array) for the JIT kernels.
+    offsets = [0]
+    flat = []
+    for deps in DEPS_INT:
+        flat.extend(deps)
+        offsets.append(len(flat))
+    DEPS_OFFSETS = np.asarray(offsets, dtype=np.int64)
+    DEPS_FLAT = np.asarray(flat, dtype=np.int64)
+    REACH = _build_reachability()
+    # Contiguous int8 statuses: the classification loop reduces over
+    # this array and the CSR adjacency instead of comparing strings.
+    db_statuses = get_all_db_statuses()
+    STATUS_ARR = np.zeros(len(MODULES), dtype=np.int8)
+    for i, m in enumerate(MODULES):
+        STATUS_ARR[i] = STATUS_CODE.get(db_statuses.get(m), ST_UNKNOWN)
+
+def invalidate_graph_cache():
+    # Public hook for graph reloads: rebuilds everything derived from g
+    # and bumps the graph version, so the epoch-keyed analysis caches
+    # miss on their next call.
+    _rebuild_caches()
+
+_rebuild_caches()
+bootstrap_module_states()
+
+# =========================
+# GRAPH KERNELS
+# =========================
+
+def _longest_path_kernel(n, offsets, flat):
+    # Kahn topological order + reverse relaxation. Returns the number of
+    # ordered nodes (< n means a cycle), longest-chain lengths, and
+    # parent pointers for path reconstruction.
+    longest = np.zeros(n, dtype=np.int64)
+    parent = np.full(n, -1, dtype=np.int64)
+    indeg = np.zeros(n, dtype=np.int64)
+    for i in range(flat.shape[0]):
+        indeg[flat[i]] += 1
+
+    order = np.zeros(n, dtype=np.int64)
+    count = 0
+    for i in range(n):
+        if indeg[i] == 0:
+            order[count] = i
+            count += 1
+    head = 0
+    while head < count:
+        m = order[head]
+        head += 1
+        for j in range(offsets[m], offsets[m + 1]):
+            d = flat[j]
+            indeg[d] -= 1
+            if indeg[d] == 0:
+                order[count] = d
+                count += 1
+
+    if count < n:
+        return count, longest, parent
+
+    for k in range(count - 1, -1, -1):
+        m = order[k]
+        best = 0
+        best_dep = -1
+        for j in range(offsets[m], offsets[m + 1]):
+            d = flat[j]
+            if longest[d] > best:
+                best = longest[d]
+                best_dep = d
+        longest[m] = 1 + best
+        parent[m] = best_dep
+
+    return count, longest, parent
+
+if njit is not None:
+    _longest_path_kernel = njit(_longest_path_kernel)
+    # Compile at startup so the first request does not pay the JIT cost.
+    _longest_path_kernel(len(MODULES), DEPS_OFFSETS, DEPS_FLAT)
 
 # =========================
 # GRAPH HELPERS
 # =========================
 
 def get_node_relations(node_name):
+    # Exact resolution only: a full IRI is used as-is, anything else is a
+    # local name looked up in the prebuilt index. The old suffix scan was
+    # O(|triples|) and fragile ("Ops" matched "DevOps").
+    if "#" in node_name or "/" in node_name:
+        uris = [URIRef(node_name)]
+    else:
+        uris = NAME_INDEX.get(node_name, ())
+
     results = []
-    for s, p, o in g:
-        if str(s).endswith(node_name) or str(o).endswith(node_name):
-            results.append({
-                "subject": str(s),
-                "predicate": str(p),
-                "object": str(o)
-            })
+    for uri in uris:
+        if OX_STORE is not None and isinstance(uri, URIRef):
+            node = pyoxigraph.NamedNode(str(uri))
+            for q in chain(
+                OX_STORE.quads_for_pattern(node, None, None, None),
+                OX_STORE.quads_for_pattern(None, None, node, None)
+            ):
+                results.append({
+                    "subject": q.subject.value,
+                    "predicate": q.predicate.value,
+                    "object": q.object.value
+                })
+        else:
+            # Literal candidates (or no oxigraph) go through rdflib.
+            for s, p, o in chain(
+                g.triples((uri, None, None)),
+                g.triples((None, None, uri))
+            ):
+                results.append({
+                    "subject": str(s),
+                    "predicate": str(p),
+                    "object": str(o)
+                })
     return results
 
 def get_dependencies(module_name):
-    module_uri = BASE[module_name]
+    if module_name in DEPS:
+        return DEPS[module_name]
+    # Names not typed as Module are not cached; query the graph directly.
     return [
-        str(dep).split("#")[-1]
-        for _, _, dep in g.triples((module_uri, BASE.dependsOnModule, None))
+        URI2NAME.get(dep, str(dep).rsplit("#", 1)[-1])
+        for dep in g.objects(BASE[module_name], DEPENDS_ON)
     ]
 
 def get_transitive_dependencies(module_name, visited=None):
+    # Bitmap fast path: the precomputed reachability turns the whole
+    # walk into one indexed lookup over the module's successor set.
+    if visited is None and REACH is not None and module_name in MODULE_ID:
+        return sorted(MODULES[i] for i in REACH[MODULE_ID[module_name]])
+
     if visited is None:
         visited = set()
 
@@ -106,27 +544,253 @@ def get_transitive_dependencies(module_name, visited=None):
             all_deps.append(dep)
             all_deps.extend(get_transitive_dependencies(dep, visited))
 
-    return list(set(all_deps))
+    # visited already dedups; sorting matches the bitmap path so both
+    # return the same deterministic order.
+    return sorted(all_deps)
 
 def get_all_modules():
-    return [
-        str(m).split("#")[-1]
-        for m in g.subjects(RDF.type, BASE.Module)
-    ]
+    return MODULES
+
+# =========================
+# ANALYSIS CACHE
+# =========================
+
+def epoch_cached(fn):
+    cache = {}
+
+    def wrapper(*args):
+        # Pick up sibling-worker writes before keying the cache.
+        _sync_db_version()
+        key = (_graph_version, _db_version, args)
+        if key not in cache:
+            cache.clear()
+            cache[key] = fn(*args)
+        return cache[key]
+
+    wrapper.__name__ = fn.__name__
+    return wrapper
 
 # =========================
 # LIFECYCLE LOGIC
 # =========================
 
+@epoch_cached
+def find_cycles():
+    # Iterative Tarjan SCC over the integer adjacency: linear time, an
+    # explicit work stack instead of recursion, and unlike a plain DFS
+    # it reports which modules form each cycle. Any SCC with more than
+    # one node, or a self-loop, is a dependency cycle.
+    n = len(MODULES)
+    index = [-1] * n
+    low = [0] * n
+    on_stack = [False] * n
+    scc_stack = []
+    cycles = []
+    counter = 0
+
+    for root in range(n):
+        if index[root] != -1:
+            continue
+        work = [(root, 0)]
+        while work:
+            node, next_i = work[-1]
+            if next_i == 0:
+                index[node] = low[node] = counter
+                counter += 1
+                scc_stack.append(node)
+                on_stack[node] = True
+
+            descended = False
+            neighbors = DEPS_INT[node]
+            for i in range(next_i, len(neighbors)):
+                d = neighbors[i]
+                if index[d] == -1:
+                    work[-1] = (node, i + 1)
+                    work.append((d, 0))
+                    descended = True
+                    break
+                if on_stack[d]:
+                    low[node] = min(low[node], index[d])
+            if descended:
+                continue
+
+            if low[node] == index[node]:
+                scc = []
+                while True:
+                    w = scc_stack.pop()
+                    on_stack[w] = False
+                    scc.append(w)
+                    if w == node:
+                        break
+                if len(scc) > 1 or node in DEPS_INT[node]:
+                    cycles.append([MODULES[i] for i in scc])
+
+            work.pop()
+            if work:
+                parent = work[-1][0]
+                low[parent] = min(low[parent], low[node])
+    return cycles
+
+def detect_cycles():
+    return bool(find_cycles())
+
+@epoch_cached
+def project_snapshot():
+    # One fused sweep over the module graph: statuses, the per-module
+    # classification (completed / ready / blocked / in-cycle) and the
+    # cycle witnesses come out of a single pass instead of each analysis
+    # re-walking the modules on its own.
+    db_statuses = get_all_db_statuses()
+    statuses = {m: db_statuses.get(m) for m in MODULES}
+    cycles = find_cycles()
+    in_cycle = set(chain.from_iterable(cycles))
+
+    # Vectorized readiness over the CSR adjacency: count each module's
+    # not-completed deps in one shot via a prefix sum over the flat
+    # neighbor array (reduceat would misreport dep-less modules).
+    not_done = (STATUS_ARR[DEPS_FLAT] != ST_COMPLETED).astype(np.int64)
+    csum = np.concatenate((np.zeros(1, dtype=np.int64), np.cumsum(not_done)))
+    blocked_deps = csum[DEPS_OFFSETS[1:]] - csum[DEPS_OFFSETS[:-1]]
+
+    pending, ready, blocked, completed = [], [], [], []
+    for i, m in enumerate(MODULES):
+        s = statuses[m]
+        if s == "completed":
+            completed.append(m)
+        elif s == "pending":
+            pending.append(m)
+            if m not in in_cycle and blocked_deps[i] == 0:
+                ready.append(m)
+            else:
+                blocked.append(m)
+
+    return {
+        "has_cycle": bool(cycles),
+        "cycles": cycles,
+        "statuses": statuses,
+        "pending": pending,
+        "ready": ready,
+        "blocked": blocked,
+        "all_completed": len(completed) == len(MODULES)
+    }
+
+def compute_next_steps():
+    snap = project_snapshot()
+    if snap["has_cycle"]:
+        return {"blocked_by_cycle": True, "next_steps": []}
+    return {"blocked_by_cycle": False, "next_steps": snap["ready"]}
+
+@epoch_cached
+def compute_critical_path():
+    # Kahn topological sort plus one relaxation pass in reverse topo
+    # order, both inside the kernel. The path is rebuilt once here by
+    # following parent pointers.
+    n = len(MODULES)
+    if n == 0:
+        return {"blocked_by_cycle": False, "critical_path": [], "length": 0}
+
+    count, longest, parent = _longest_path_kernel(n, DEPS_OFFSETS, DEPS_FLAT)
+    if count < n:
+        return {"blocked_by_cycle": True, "critical_path": [], "length": 0}
+
+    node = int(np.argmax(longest))
+    path = []
+    while node != -1:
+        path.append(MODULES[node])
+        node = int(parent[node])
+
+    return {"blocked_by_cycle": False, "critical_path": path, "length": len(path)}
+
+@epoch_cached
+def compute_operational_critical_path():
+    # Critical path restricted to modules still outstanding: completed
+    # modules cost nothing, so the topo-order DP runs on the active
+    # subgraph only. Same iterative shape as compute_critical_path.
+    # Statuses come from the epoch's shared snapshot, not a second SELECT.
+    statuses = project_snapshot()["statuses"]
+    active = [
+        i for i, m in enumerate(MODULES)
+        if statuses.get(m) != "completed"
+    ]
+    active_set = set(active)
+    if not active:
+        return {"blocked_by_cycle": False, "critical_path": [], "length": 0}
+
+    indeg = {i: 0 for i in active}
+    for i in active:
+        for d in DEPS_INT[i]:
+            if d in active_set:
+                indeg[d] += 1
+
+    queue = [i for i in active if indeg[i] == 0]
+    order = []
+    while queue:
+        m = queue.pop()
+        order.append(m)
+        for d in DEPS_INT[m]:
+            if d in active_set:
+                indeg[d] -= 1
+                if indeg[d] == 0:
+                    queue.append(d)
+
+    if len(order) < len(active):
+        return {"blocked_by_cycle": True, "critical_path": [], "length": 0}
+
+    longest = {}
+    parent = {}
+    for m in reversed(order):
+        best, best_dep = 0, -1
+        for d in DEPS_INT[m]:
+            if d in active_set and longest[d] > best:
+                best, best_dep = longest[d], d
+        longest[m] = 1 + best
+        parent[m] = best_dep
+
+    node = max(longest, key=longest.get)
+    path = []
+    while node != -1:
+        path.append(MODULES[node])
+        node = parent[node]
+
+    return {"blocked_by_cycle": False, "critical_path": path, "length": len(path)}
+
+@epoch_cached
+def diagnose_stall():
+    # Explain why nothing is progressing: cycle witnesses from Tarjan
+    # name the exact modules to break apart, and every blocked module is
+    # listed with the dependencies holding it back.
+    snap = project_snapshot()
+    statuses = snap["statuses"]
+
+    recommendations = []
+    for cycle in snap["cycles"]:
+        recommendations.append(
+            "Break the dependency cycle: " + " -> ".join(cycle + cycle[:1])
+        )
+    for m in snap["blocked"]:
+        waiting_on = [
+            d for d in DEPS.get(m, ())
+            if statuses.get(d) != "completed"
+        ]
+        if waiting_on:
+            recommendations.append(
+                f"'{m}' is waiting on: {', '.join(waiting_on)}"
+            )
+
+    return {
+        "stalled": not snap["ready"] and not snap["all_completed"],
+        "cycles": snap["cycles"],
+        "recommendations": recommendations
+    }
+
 def evaluate_project_state():
-    modules = get_all_modules()
+    snap = project_snapshot()
 
-    if all(get_db_status(m) == "completed" for m in modules):
+    if snap["all_completed"]:
         return "completed"
 
-    for m in modules:
-        if get_db_status(m) == "pending":
-            return "active"
+    if snap["pending"]:
+        return "active"
 
     return "stalled"
 
@@ -134,154 +798,262 @@ def evaluate_project_state():
 # TOOL ROUTER
 # =========================
 
-def handle_tool_call(tool, args, id):
+# ===== ONTOLOGY MODULE =====
+
+@lru_cache(maxsize=4096)
+def _node_relations_result(node_name, graph_version):
+    # Repeat lookups of the same node skip the graph walk and the JSON
+    # encoding entirely; only the request id gets spliced in per call.
+    # graph_version is part of the key, so a closure swap strands stale
+    # entries and LRU pressure ages them out.
+    result = {
+        "content": [{
+            "type": "text",
+            "text": orjson.dumps(get_node_relations(node_name)).decode()
+        }],
+        "isError": False
+    }
+    return orjson.dumps(result)
+
+def tool_get_node_relations(args, id):
+    return encode_result(id, _node_relations_result(args.get("node"), _graph_version))
 
-    # ===== ONTOLOGY MODULE =====
-    if tool == "get_node_relations":
-        node = args.get("node")
-        data = get_node_relations(node)
-        return tool_success(id, data)
+def tool_get_dependencies(args, id):
+    return tool_success(id, get_dependencies(args.get("module")))
 
-    if tool == "get_dependencies":
-        module = args.get("module")
-        data = get_dependencies(module)
-        return tool_success(id, data)
+def tool_get_transitive_dependencies(args, id):
+    return tool_success(id, get_transitive_dependencies(args.get("module")))
 
-    if tool == "get_transitive_dependencies":
-        module = args.get("module")
-        data = get_transitive_dependencies(module)
-        return tool_success(id, data)
+# ===== LIFECYCLE MODULE =====
 
-    # ===== LIFECYCLE MODULE =====
-    if tool == "update_module_status":
-        set_db_status(args["module"], args["status"])
-        return tool_success(id, {"status": "updated"})
+def tool_update_module_status(args, id):
+    set_db_status(args["module"], args["status"])
+    return tool_success(id, {"status": "updated"})
 
-    if tool == "get_module_statuses":
-        modules = get_all_modules()
-        statuses = {m: get_db_status(m) for m in modules}
-        return tool_success(id, statuses)
+def tool_get_module_statuses(args, id):
+    return tool_success(id, project_snapshot()["statuses"])
 
-    if tool == "evaluate_project_state":
-        state = evaluate_project_state()
-        return tool_success(id, {"project_state": state})
+def tool_evaluate_project_state(args, id):
+    return tool_success(id, {"project_state": evaluate_project_state()})
 
-    return tool_error(id, "Tool not found")
+def tool_detect_dependency_cycles(args, id):
+    snap = project_snapshot()
+    return tool_success(id, {"has_cycle": snap["has_cycle"], "cycles": snap["cycles"]})
+
+def tool_get_project_next_steps(args, id):
+    return tool_success(id, compute_next_steps())
+
+def tool_diagnose_stall(args, id):
+    return tool_success(id, diagnose_stall())
+
+def tool_compute_critical_path(args, id):
+    return tool_success(id, compute_critical_path())
+
+def tool_compute_operational_critical_path(args, id):
+    return tool_success(id, compute_operational_critical_path())
+
+# O(1) hash dispatch instead of a linear string-compare chain.
+TOOLS = {
+    "get_node_relations": tool_get_node_relations,
+    "get_dependencies": tool_get_dependencies,
+    "get_transitive_dependencies": tool_get_transitive_dependencies,
+    "update_module_status": tool_update_module_status,
+    "get_module_statuses": tool_get_module_statuses,
+    "evaluate_project_state": tool_evaluate_project_state,
+    "detect_dependency_cycles": tool_detect_dependency_cycles,
+    "get_project_next_steps": tool_get_project_next_steps,
+    "diagnose_stall": tool_diagnose_stall,
+    "compute_critical_path": tool_compute_critical_path,
+    "compute_operational_critical_path": tool_compute_operational_critical_path
+}
+
+def handle_tool_call(tool, args, id):
+    fn = TOOLS.get(tool)
+    if fn is None:
+        return tool_error(id, "Tool not found")
+    return fn(args, id)
 
 # =========================
-# MCP ENDPOINT
+# STATIC RESPONSES
 # =========================
 
-@app.post("/mcp")
-async def mcp(request: Request):
-    body = await request.json()
-    method = body.get("method")
-    id = body.get("id")
-    params = body.get("params", {})
-
-    if method == "initialize":
-        return JSONResponse({
-            "jsonrpc": "2.0",
-            "id": id,
-            "result": {
-                "protocolVersion": MCP_PROTOCOL_VERSION,
-                "capabilities": {"tools": {}},
-                "serverInfo": {
-                    "name": "ai-mcp-server",
-                    "version": "12.0.0"
-                }
+INITIALIZE_RESULT = {
+    "protocolVersion": MCP_PROTOCOL_VERSION,
+    "capabilities": {"tools": {}},
+    "serverInfo": {
+        "name": "ai-mcp-server",
+        "version": "12.0.0"
+    }
+}
+
+TOOLS_LIST_RESULT = {
+    "tools": [
+        {
+            "name": "get_node_relations",
+            "description": "Return RDF triples for a node",
+            "inputSchema": {
+                "type": "object",
+                "properties": {"node": {"type": "string"}},
+                "required": ["node"]
+            }
+        },
+        {
+            "name": "get_dependencies",
+            "description": "Return direct dependencies of a module",
+            "inputSchema": {
+                "type": "object",
+                "properties": {"module": {"type": "string"}},
+                "required": ["module"]
+            }
+        },
+        {
+            "name": "get_transitive_dependencies",
+            "description": "Return multi-hop dependencies",
+            "inputSchema": {
+                "type": "object",
+                "properties": {"module": {"type": "string"}},
+                "required": ["module"]
             }
-        })
-
-    if method == "tools/list":
-        return JSONResponse({
-            "jsonrpc": "2.0",
-            "id": id,
-            "result": {
-                "tools": [
-                    {
-                        "name": "get_node_relations",
-                        "description": "Return RDF triples for a node",
-                        "inputSchema": {
-                            "type": "object",
-                            "properties": {"node": {"type": "string"}},
-                            "required": ["node"]
-                        }
-                    },
-                    {
-                        "name": "get_dependencies",
-                        "description": "Return direct dependencies of a module",
-                        "inputSchema": {
-                            "type": "object",
-                            "properties": {"module": {"type": "string"}},
-                            "required": ["module"]
-                        }
-                    },
-                    {
-                        "name": "get_transitive_dependencies",
-                        "description": "Return multi-hop dependencies",
-                        "inputSchema": {
-                            "type": "object",
-                            "properties": {"module": {"type": "string"}},
-                            "required": ["module"]
-                        }
-                    },
-                    {
-                        "name": "update_module_status",
-                        "description": "Update module status",
-                        "inputSchema": {
-                            "type": "object",
-                            "properties": {
-                                "module": {"type": "string"},
-                                "status": {"type": "string"}
-                            },
-                            "required": ["module", "status"]
-                        }
-                    },
-                    {
-                        "name": "get_module_statuses",
-                        "description": "List module statuses",
-                        "inputSchema": {"type": "object", "properties": {}}
-                    },
-                    {
-                        "name": "evaluate_project_state",
-                        "description": "Evaluate lifecycle state",
-                        "inputSchema": {"type": "object", "properties": {}}
-                    }
-                ]
+        },
+        {
+            "name": "update_module_status",
+            "description": "Update module status",
+            "inputSchema": {
+                "type": "object",
+                "properties": {
+                    "module": {"type": "string"},
+                    "status": {"type": "string"}
+                },
+                "required": ["module", "status"]
             }
-        })
+        },
+        {
+            "name": "get_module_statuses",
+            "description": "List module statuses",
+            "inputSchema": {"type": "object", "properties": {}}
+        },
+        {
+            "name": "evaluate_project_state",
+            "description": "Evaluate lifecycle state",
+            "inputSchema": {"type": "object", "properties": {}}
+        },
+        {
+            "name": "detect_dependency_cycles",
+            "description": "Check the module graph for dependency cycles",
+            "inputSchema": {"type": "object", "properties": {}}
+        },
+        {
+            "name": "get_project_next_steps",
+            "description": "List pending modules whose dependencies are completed",
+            "inputSchema": {"type": "object", "properties": {}}
+        },
+        {
+            "name": "diagnose_stall",
+            "description": "Explain why no modules are progressing",
+            "inputSchema": {"type": "object", "properties": {}}
+        },
+        {
+            "name": "compute_critical_path",
+            "description": "Longest dependency chain in the module graph",
+            "inputSchema": {"type": "object", "properties": {}}
+        },
+        {
+            "name": "compute_operational_critical_path",
+            "description": "Longest dependency chain among non-completed modules",
+            "inputSchema": {"type": "object", "properties": {}}
+        }
+    ]
+}
 
-    if method == "tools/call":
-        tool = params.get("name")
-        args = params.get("arguments", {})
-        return JSONResponse(handle_tool_call(tool, args, id))
+def _result_template(result):
+    # Envelope serialized once at import; only the id is spliced per request.
+    return b'{"jsonrpc":"2.0","id":%b,"result":' + orjson.dumps(result) + b"}"
 
-    return JSONResponse(tool_error(id, "Method not found"))
+INITIALIZE_TEMPLATE = _result_template(INITIALIZE_RESULT)
+TOOLS_LIST_TEMPLATE = _result_template(TOOLS_LIST_RESULT)
+
+def static_response(template, id):
+    content = template % orjson.dumps(id)
+    return Response(content=content, media_type="application/json")
+
+# =========================
+# MCP ENDPOINT
+# =========================
+
+async def handle_initialize(id, params):
+    return static_response(INITIALIZE_TEMPLATE, id)
+
+async def handle_tools_list(id, params):
+    return static_response(TOOLS_LIST_TEMPLATE, id)
+
+async def handle_tools_call(id, params):
+    tool = params.get("name")
+    args = params.get("arguments", {})
+    return handle_tool_call(tool, args, id)
+
+METHOD_HANDLERS = {
+    "initialize": handle_initialize,
+    "tools/list": handle_tools_list,
+    "tools/call": handle_tools_call
+}
+
+class RawMCP:
+    # Pure ASGI endpoint for the hot path: no Starlette Request object,
+    # no dependency injection, no response_class round trip. Read the
+    # bytes, orjson-decode, dispatch, and let the handler's Response
+    # speak ASGI itself. (A plain function here would get wrapped by
+    # Starlette's request_response; a class instance is mounted as-is.)
+    async def __call__(self, scope, receive, send):
+        raw = b""
+        while True:
+            message = await receive()
+            raw += message.get("body", b"")
+            if not message.get("more_body", False):
+                break
+        body = orjson.loads(raw)
+        method = body.get("method")
+        id = body.get("id")
+        params = body.get("params", {})
+
+        handler = METHOD_HANDLERS.get(method)
+        if handler is None:
+            response = tool_error(id, "Method not found")
+        else:
+            response = await handler(id, params)
+        if not REASONING_READY.is_set():
+            # Cold start: answers come from the unreasoned graph until
+            # the background expansion lands.
+            response.headers["X-Reasoning-Pending"] = "true"
+        await response(scope, receive, send)
+
+app.router.routes.append(Route("/mcp", endpoint=RawMCP(), methods=["POST"]))
 
 # =========================
 # HELPERS
 # =========================
 
+def encode_result(id, result_bytes):
+    # Splice prebuilt result bytes into the envelope instead of building
+    # and re-encoding the wrapper dict per response.
+    content = (
+        b'{"jsonrpc":"2.0","id":' + orjson.dumps(id)
+        + b',"result":' + result_bytes + b"}"
+    )
+    return Response(content=content, media_type="application/json")
+
 def tool_success(id, payload):
-    return {
-        "jsonrpc": "2.0",
-        "id": id,
-        "result": {
-            "content": [{
-                "type": "text",
-                "text": json.dumps(payload)
-            }],
-            "isError": False
-        }
+    result = {
+        "content": [{
+            "type": "text",
+            "text": orjson.dumps(payload).decode()
+        }],
+        "isError": False
     }
+    return encode_result(id, orjson.dumps(result))
 
 def tool_error(id, message):
-    return {
-        "jsonrpc": "2.0",
-        "id": id,
-        "error": {
-            "code": -32601,
-            "message": message
-        }
-    }
\ No newline at end of file
+    content = (
+        b'{"jsonrpc":"2.0","id":' + orjson.dumps(id)
+        + b',"error":{"code":-32601,"message":' + orjson.dumps(message) + b"}}"
+    )
+    return Response(content=content, media_type="application/json")
\ No newline at end of file